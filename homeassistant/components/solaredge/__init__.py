@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 from requests.exceptions import ConnectTimeout, HTTPError
-from solaredge import Solaredge
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_API_KEY
@@ -10,6 +9,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
 import homeassistant.helpers.config_validation as cv
 
+from .api import SolarEdgeClient
 from .const import CONF_SITE_ID, DATA_API_CLIENT, DOMAIN, LOGGER
 
 CONFIG_SCHEMA = cv.deprecated(DOMAIN)
@@ -23,7 +23,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.config_entries.async_setup_platforms(entry, PLATFORMS)
 
     return True
-    api = Solaredge(entry.data[CONF_API_KEY])
+    api = SolarEdgeClient(entry.data[CONF_API_KEY])
 
     try:
         response = await hass.async_add_executor_job(
@@ -0,0 +1,120 @@
+"""Client for the SolarEdge Monitoring API with conditional request support."""
+from __future__ import annotations
+
+from http import HTTPStatus
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from solaredge import Solaredge
+from urllib3.util.retry import Retry
+
+from .const import MAX_CONCURRENT_REQUESTS
+
+BASE_URL = "https://monitoringapi.solaredge.com"
+
+# Seconds to wait for the API, so a hung request cannot stall all data services.
+REQUEST_TIMEOUT = 10
+
+# Retry transient server errors only. A 429 means the daily or the concurrent
+# request limit was hit, retrying it would only waste more requests.
+RETRY = Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=(500, 502, 503, 504),
+    raise_on_status=False,
+)
+
+
+class SolarEdgeClient(Solaredge):
+    """SolarEdge API client which revalidates responses instead of refetching them.
+
+    The last response of every endpoint is cached per site together with its
+    query parameters and its ETag and Last-Modified validators. Subsequent
+    requests with the same query parameters send them as If-None-Match and
+    If-Modified-Since headers, and a 304 Not Modified answer returns the cached
+    payload without downloading or parsing it again.
+    """
+
+    def __init__(self, api_key: str) -> None:
+        """Initialize the client."""
+        super().__init__(api_key)
+        self.session = requests.Session()
+        self.session.mount(
+            BASE_URL,
+            HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=MAX_CONCURRENT_REQUESTS,
+                pool_block=True,
+                max_retries=RETRY,
+            ),
+        )
+        self._cache: dict[
+            tuple[str, str], tuple[dict[str, str], dict[str, str], dict[str, Any]]
+        ] = {}
+
+    def get_overview(self, site_id: str) -> dict[str, Any]:
+        """Get the site overview."""
+        return self._get_json("overview", site_id)
+
+    def get_details(self, site_id: str) -> dict[str, Any]:
+        """Get the site details."""
+        return self._get_json("details", site_id)
+
+    def get_inventory(self, site_id: str) -> dict[str, Any]:
+        """Get the site inventory."""
+        return self._get_json("inventory", site_id)
+
+    def get_current_power_flow(self, site_id: str) -> dict[str, Any]:
+        """Get the current power flow of the site."""
+        return self._get_json("currentPowerFlow", site_id)
+
+    def get_energy_details(
+        self,
+        site_id: str,
+        start_time: str,
+        end_time: str,
+        meters: str | None = None,
+        time_unit: str = "DAY",
+    ) -> dict[str, Any]:
+        """Get the energy details of the site between start_time and end_time."""
+        params = {"startTime": start_time, "endTime": end_time, "timeUnit": time_unit}
+        if meters:
+            params["meters"] = meters
+        return self._get_json("energyDetails", site_id, params)
+
+    def _get_json(
+        self, endpoint: str, site_id: str, params: dict[str, str] | None = None
+    ) -> dict[str, Any]:
+        """Request an endpoint, reusing the cached payload when it is unchanged."""
+        params = params or {}
+        cache_key = (endpoint, str(site_id))
+        # The validators only apply to the same query, e.g. not to the next time
+        # window of the energy details.
+        cached = self._cache.get(cache_key)
+        if cached and cached[0] != params:
+            cached = None
+        headers = cached[1] if cached else {}
+
+        response = self.session.get(
+            f"{BASE_URL}/site/{site_id}/{endpoint}",
+            params={"api_key": self.token, **params},
+            headers=headers,
+            timeout=REQUEST_TIMEOUT,
+        )
+        if cached and response.status_code == HTTPStatus.NOT_MODIFIED:
+            return cached[2]
+        response.raise_for_status()
+
+        payload = response.json()
+        validators = {}
+        if etag := response.headers.get("ETag"):
+            validators["If-None-Match"] = etag
+        if last_modified := response.headers.get("Last-Modified"):
+            validators["If-Modified-Since"] = last_modified
+
+        if validators:
+            self._cache[cache_key] = (params, validators, payload)
+        else:
+            self._cache.pop(cache_key, None)
+        return payload
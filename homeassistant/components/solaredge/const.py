@@ -37,9 +37,25 @@ ENERGY_DETAILS_DAILY_UPDATE_LIMIT = API_DAILY_REQUEST_LIMIT / 3
 DETAILS_DAILY_UPDATE_LIMIT = 2
 INVENTORY_DAILY_UPDATE_LIMIT = 2
 
+# The API answers more than this many concurrent requests from one IP address with 429.
+MAX_CONCURRENT_REQUESTS = 3
+
 # How much of the daily limit that is distributed during daylight vs dark.
 LIMIT_WHILE_DAYLIGHT_RATIO = 0.95
 
+# Data fetched less than one update interval (minus this margin for timer jitter) ago is fresh.
+FRESH_DATA_MARGIN = timedelta(seconds=10)
+
+# Stale data is served while it is refreshed in the background, until it is this many update intervals old.
+STALE_DATA_UPDATE_INTERVALS = 2
+
+# Number of consecutive failed updates before the last known data is no longer served.
+UPDATE_FAILURE_TOLERANCE = 3
+
+# The update interval is stretched by this factor for every consecutive unchanged response, up to the maximum factor.
+UNCHANGED_BACKOFF_FACTOR = 1.5
+UNCHANGED_BACKOFF_MAX_FACTOR = 4
+
 # Supported overview sensors
 SENSOR_TYPES = [
     SolarEdgeSensorEntityDescription(
@@ -2,21 +2,69 @@
 from __future__ import annotations
 
 from abc import abstractmethod
+import asyncio
 from datetime import date, datetime, timedelta
-from typing import Optional
+from typing import Any, Optional
 
+from requests.exceptions import RequestException
 from solaredge import Solaredge
 from stringcase import snakecase
 from unittest.mock import MagicMock
 
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util.dt import utcnow
+
+from .const import (
+    FRESH_DATA_MARGIN,
+    LOGGER,
+    MAX_CONCURRENT_REQUESTS,
+    STALE_DATA_UPDATE_INTERVALS,
+    UNCHANGED_BACKOFF_FACTOR,
+    UNCHANGED_BACKOFF_MAX_FACTOR,
+    UPDATE_FAILURE_TOLERANCE,
+)
+from .models import SolarEdgeEndpoint
+
+# Ordered from the longest to the shortest period, so the values never increase.
+_OVERVIEW_ENERGY_ORDER = (
+    "lifeTimeData",
+    "lastYearData",
+    "lastMonthData",
+    "lastDayData",
+)
+_OVERVIEW_ENERGY_KEYS = frozenset(_OVERVIEW_ENERGY_ORDER)
+_OVERVIEW_POWER_KEYS = frozenset(("currentPower",))
+_DETAILS_SNAKECASE_KEYS = {
+    key: snakecase(key)
+    for key in (
+        "primaryModule",
+        "peakPower",
+        "type",
+        "name",
+        "lastUpdateTime",
+        "installationDate",
+        "status",
+        "manufacturerName",
+        "modelName",
+        "maximumPower",
+        "temperatureCoef",
+    )
+}
+_DETAILS_ATTR_KEYS = frozenset(
+    ("peak_power", "type", "name", "last_update_time", "installation_date")
+)
+_ENERGY_DETAILS_METER_TYPES = frozenset(
+    ("Production", "SelfConsumption", "FeedIn", "Purchased", "Consumption")
+)
+_POWER_FLOW_KEYS = ("LOAD", "PV", "GRID", "STORAGE")
 
-from .const import LOGGER
 
 class SolarEdgeDataService:
     """Get and update the latest data."""
 
+    endpoint: SolarEdgeEndpoint
+
     def __init__(self, hass: HomeAssistant,
             api: Solaredge,
             site_id: str,
@@ -31,6 +79,8 @@ class SolarEdgeDataService:
 
         self.hass = hass
         self.coordinator = None
+        self.request_semaphore: asyncio.Semaphore | None = None
+        self.last_update_success = True
 
         self.daily_update_limit = daily_update_limit
         self.daylight_update_limit_percentage = daylight_update_limit_percentage
@@ -38,24 +88,57 @@ class SolarEdgeDataService:
         # Set default update limit. This will be modified dynamically based on daylight for if self.daylight_update_limit_percentage is not None.
         self.current_update_interval = timedelta(minutes=((24*60) / self.daily_update_limit))
 
-    @callback
-    def async_setup(self) -> None:
-        """Coordinator creation."""
-        self.coordinator = DataUpdateCoordinator(
-            self.hass,
-            LOGGER,
-            name=str(self),
-            update_method=self.async_update_data,
-            update_interval=self.current_update_interval,
+        self._last_update: datetime | None = None
+        self._failed_updates = 0
+        self._revalidate_task: asyncio.Task | None = None
+        self._inflight: asyncio.Task | None = None
+        self._response_hash: int | None = None
+        self._unchanged_updates = 0
+
+    @property
+    def update_interval(self) -> timedelta:
+        """Return the update interval, stretched while the responses do not change."""
+        return self.current_update_interval * min(
+            UNCHANGED_BACKOFF_FACTOR ** self._unchanged_updates,
+            UNCHANGED_BACKOFF_MAX_FACTOR,
         )
 
     @abstractmethod
     def update(self) -> None:
         """Update data in executor."""
 
+    @abstractmethod
+    def parse(self, payload: dict) -> None:
+        """Update data from the payload of a changed endpoint response."""
+
+    def _extract(self, *args: Any, **kwargs: Any) -> None:
+        """Request the endpoint of the service and parse the response if it changed."""
+        try:
+            response = getattr(self.api, self.endpoint.api_method)(
+                self.site_id, *args, **kwargs
+            )
+            payload = response[self.endpoint.root_key]
+        except KeyError as ex:
+            raise UpdateFailed(
+                f"Missing {self.endpoint.name} data, skipping update"
+            ) from ex
+
+        response_hash = hash(repr(response))
+        if response_hash == self._response_hash:
+            LOGGER.debug("Unchanged SolarEdge response for %s, skipping update", self)
+            self._unchanged_updates += 1
+            return
+
+        # Only remember the response once it parsed, so a rejected one is checked again.
+        self.parse(payload)
+        self._response_hash = response_hash
+        self._unchanged_updates = 0
+
     async def recalculate_update_interval(self, duration: timedelta, daylight: bool) -> None:
         """ Recalculate update_interval based on available daylight """
-        
+        # Check for changed responses at the regular interval again.
+        self._unchanged_updates = 0
+
         # Only alter update_interval for services that uses daylight_update_limit_percentage 
         if not self.daylight_update_limit_percentage:
             return
@@ -66,39 +149,224 @@ class SolarEdgeDataService:
             update_limit = (1 - self.daylight_update_limit_percentage) * self.daily_update_limit
 
         self.current_update_interval = timedelta(seconds=duration.seconds / update_limit)
-        self.coordinator.update_interval = self.current_update_interval
         LOGGER.warning(f"{self.__class__} Recalculated update interval={self.current_update_interval.seconds/60.0} for daylight={daylight} duration={duration.seconds/60} ")
 
+    def reset_update_interval(self) -> None:
+        """Reset the update interval to the daily update limit evenly distributed."""
+        self.current_update_interval = timedelta(days=1) / self.daily_update_limit
+        self._unchanged_updates = 0
+
+    async def async_update_data(self) -> None:
+        """Update data, serving the last known data while it is refreshed."""
+        if self._last_update is not None:
+            age = utcnow() - self._last_update
+            if age < self.update_interval - FRESH_DATA_MARGIN:
+                return
+            if (
+                age < self.update_interval * STALE_DATA_UPDATE_INTERVALS
+                and self._failed_updates < UPDATE_FAILURE_TOLERANCE
+            ):
+                if self._revalidate_task is None:
+                    self._revalidate_task = self.hass.async_create_task(
+                        self._async_revalidate()
+                    )
+                return
+
+        try:
+            await self._async_fetch()
+        except UpdateFailed as ex:
+            if (
+                self._last_update is None
+                or self._failed_updates >= UPDATE_FAILURE_TOLERANCE
+            ):
+                raise
+            LOGGER.debug("Keeping last known data for %s: %s", self, ex)
+
+    async def _async_revalidate(self) -> None:
+        """Refresh stale data in the background and notify the listeners."""
+        try:
+            await self._async_fetch()
+        except UpdateFailed as ex:
+            LOGGER.debug("Background update for %s failed: %s", self, ex)
+        else:
+            self.coordinator.async_set_updated_data(None)
+        finally:
+            self._revalidate_task = None
+
+    async def _async_fetch(self) -> None:
+        """Fetch new data, joining the fetch that is already in progress if any."""
+        if self._inflight is None or self._inflight.done():
+            self._inflight = self.hass.async_create_task(self._async_run_update())
+
+        inflight = self._inflight
+        try:
+            await asyncio.shield(inflight)
+        finally:
+            if self._inflight is inflight and inflight.done():
+                self._inflight = None
+
+    async def _async_run_update(self) -> None:
+        """Run the update in the executor and keep track of failed updates."""
+        if self.request_semaphore is None:
+            self.request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+        try:
+            async with self.request_semaphore:
+                await self.hass.async_add_executor_job(self.update)
+        except RequestException as ex:
+            self._failed_updates += 1
+            raise UpdateFailed(f"Error communicating with SolarEdge API: {ex}") from ex
+        except UpdateFailed:
+            self._failed_updates += 1
+            raise
+
+        self._failed_updates = 0
+        self._last_update = utcnow()
+
+
+class SolarEdgeCombinedCoordinator:
+    """Update all data services of a site from one shared coordinator."""
+
+    def __init__(
+        self, hass: HomeAssistant, services: tuple[SolarEdgeDataService, ...]
+    ) -> None:
+        """Initialize the combined coordinator."""
+        self.hass = hass
+        self.services = services
+        self.coordinator = None
+
+        # Sunrise and sunset of today and the sunrise of tomorrow, set every midnight.
+        self.sun_events: tuple[datetime, datetime, datetime] | None = None
+        self.daylight: bool | None = None
+
+    @property
+    def update_interval(self) -> timedelta:
+        """Return the update interval of the most frequently updated service."""
+        return min(service.current_update_interval for service in self.services)
+
+    @callback
+    def async_setup(self) -> None:
+        """Coordinator creation."""
+        self.coordinator = DataUpdateCoordinator(
+            self.hass,
+            LOGGER,
+            name=str(self),
+            update_method=self.async_update_data,
+            update_interval=self.update_interval,
+        )
+        # Shared by the services, so their requests stay within the concurrency limit.
+        request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        for service in self.services:
+            service.coordinator = self.coordinator
+            service.request_semaphore = request_semaphore
+
+    async def recalculate_update_interval(
+        self, duration: timedelta, daylight: bool
+    ) -> None:
+        """Recalculate the update interval of all services based on daylight."""
+        for service in self.services:
+            await service.recalculate_update_interval(duration, daylight)
+        self.coordinator.update_interval = self.update_interval
+
+    async def async_refresh(self) -> None:
+        """Refresh all services."""
+        await self.coordinator.async_refresh()
+
+    async def _async_update_daylight(
+        self, now: datetime, sun_events: tuple[datetime, datetime, datetime]
+    ) -> None:
+        """Recalculate the update intervals when daylight started or ended."""
+        sunrise, sunset, _ = sun_events
+        daylight = sunrise <= now < sunset
+        if daylight == self.daylight:
+            return
+
+        self.daylight = daylight
+        duration = sunset - sunrise
+        if not daylight:
+            duration = timedelta(days=1) - duration
+        await self.recalculate_update_interval(duration, daylight)
+
+    def _next_update_interval(
+        self, now: datetime, sun_events: tuple[datetime, datetime, datetime]
+    ) -> timedelta:
+        """Return the update interval, shortened to update when daylight starts or ends."""
+        for event in sun_events:
+            if event > now:
+                return min(self.update_interval, event - now)
+        return self.update_interval
+
     async def async_update_data(self) -> None:
-        """Update data."""
-        await self.hass.async_add_executor_job(self.update)
+        """Update the services which are due, keeping track of failures per service."""
+        # The timer may fire the update scheduled at sunrise or sunset slightly early.
+        now = utcnow() + FRESH_DATA_MARGIN
+        if (sun_events := self.sun_events) is not None:
+            await self._async_update_daylight(now, sun_events)
+            update_interval = self._next_update_interval(now, sun_events)
+        else:
+            # Polar day or night, fall back to the default update intervals.
+            if self.daylight is not None:
+                self.daylight = None
+                for service in self.services:
+                    service.reset_update_interval()
+            update_interval = self.update_interval
+        self.coordinator.update_interval = update_interval
+
+        results = await asyncio.gather(
+            *(service.async_update_data() for service in self.services),
+            return_exceptions=True,
+        )
+        for service, result in zip(self.services, results):
+            if isinstance(result, UpdateFailed):
+                if service.last_update_success:
+                    LOGGER.error(
+                        "Error fetching %s data: %s", service.endpoint.name, result
+                    )
+                service.last_update_success = False
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                service.last_update_success = True
+
+        if not any(service.last_update_success for service in self.services):
+            raise UpdateFailed("Update of all SolarEdge data services failed")
 
 
 class SolarEdgeOverviewDataService(SolarEdgeDataService):
     """Get and update the latest overview data."""
 
+    endpoint = SolarEdgeEndpoint("get_overview", "overview", "overview")
+
     def update(self) -> None:
         """Update the data from the SolarEdge Monitoring API."""
         LOGGER.warning(f"Overview update")
 
         self.data = {}
         return
-        try:
-            data = self.api.get_overview(self.site_id)
-            overview = data["overview"]
-        except KeyError as ex:
-            raise UpdateFailed("Missing overview data, skipping update") from ex
+        self._extract()
 
-        self.data = {}
+    def parse(self, payload: dict) -> None:
+        """Update the overview data from the API response."""
+        new_data = {}
 
-        for key, value in overview.items():
-            if key in ["lifeTimeData", "lastYearData", "lastMonthData", "lastDayData"]:
+        for key, value in payload.items():
+            if key in _OVERVIEW_ENERGY_KEYS:
                 data = value["energy"]
-            elif key in ["currentPower"]:
+            elif key in _OVERVIEW_POWER_KEYS:
                 data = value["power"]
             else:
                 data = value
-            self.data[key] = data
+            new_data[key] = data
+
+        energy = [new_data.get(key) for key in _OVERVIEW_ENERGY_ORDER]
+        if None not in energy and any(
+            longer < shorter for longer, shorter in zip(energy, energy[1:])
+        ):
+            raise UpdateFailed(
+                f"Invalid energy values in overview data, skipping update: {energy}"
+            )
+
+        self.data = new_data
 
         LOGGER.debug("Updated SolarEdge overview: %s", self.data)
 
@@ -106,6 +374,8 @@ class SolarEdgeOverviewDataService(SolarEdgeDataService):
 class SolarEdgeDetailsDataService(SolarEdgeDataService):
     """Get and update the latest details data."""
 
+    endpoint = SolarEdgeEndpoint("get_details", "details", "details")
+
     def __init__(self, hass: HomeAssistant, api: Solaredge, site_id: str,
             daily_update_limit: int,
             daylight_update_limit_percentage: Optional[float] = None) -> None:
@@ -121,31 +391,28 @@ class SolarEdgeDetailsDataService(SolarEdgeDataService):
         self.data = None
         self.attributes = {}
         return
-        try:
-            data = self.api.get_details(self.site_id)
-            details = data["details"]
-        except KeyError as ex:
-            raise UpdateFailed("Missing details data, skipping update") from ex
+        self._extract()
 
-        self.data = None
-        self.attributes = {}
+    def parse(self, payload: dict) -> None:
+        """Update the details data from the API response."""
+        status = None
+        new_attrs = {}
 
-        for key, value in details.items():
-            key = snakecase(key)
+        for key, value in payload.items():
+            key = _DETAILS_SNAKECASE_KEYS.get(key) or snakecase(key)
 
-            if key in ["primary_module"]:
+            if key == "primary_module":
                 for module_key, module_value in value.items():
-                    self.attributes[snakecase(module_key)] = module_value
-            elif key in [
-                "peak_power",
-                "type",
-                "name",
-                "last_update_time",
-                "installation_date",
-            ]:
-                self.attributes[key] = value
+                    module_key = _DETAILS_SNAKECASE_KEYS.get(module_key) or snakecase(
+                        module_key
+                    )
+                    new_attrs[module_key] = module_value
+            elif key in _DETAILS_ATTR_KEYS:
+                new_attrs[key] = value
             elif key == "status":
-                self.data = value
+                status = value
+
+        self.data, self.attributes = status, new_attrs
 
         LOGGER.debug("Updated SolarEdge details: %s, %s", self.data, self.attributes)
 
@@ -153,6 +420,8 @@ class SolarEdgeDetailsDataService(SolarEdgeDataService):
 class SolarEdgeInventoryDataService(SolarEdgeDataService):
     """Get and update the latest inventory data."""
 
+    endpoint = SolarEdgeEndpoint("get_inventory", "Inventory", "inventory")
+
     def update(self) -> None:
         """Update the data from the SolarEdge Monitoring API."""
         LOGGER.warning("Inventory update")
@@ -160,18 +429,18 @@ class SolarEdgeInventoryDataService(SolarEdgeDataService):
         self.data = {}
         self.attributes = {}
         return
-        try:
-            data = self.api.get_inventory(self.site_id)
-            inventory = data["Inventory"]
-        except KeyError as ex:
-            raise UpdateFailed("Missing inventory data, skipping update") from ex
+        self._extract()
 
-        self.data = {}
-        self.attributes = {}
+    def parse(self, payload: dict) -> None:
+        """Update the inventory data from the API response."""
+        new_data = {}
+        new_attrs = {}
 
-        for key, value in inventory.items():
-            self.data[key] = len(value)
-            self.attributes[key] = {key: value}
+        for key, value in payload.items():
+            new_data[key] = len(value)
+            new_attrs[key] = value
+
+        self.data, self.attributes = new_data, new_attrs
 
         LOGGER.debug("Updated SolarEdge inventory: %s, %s", self.data, self.attributes)
 
@@ -179,6 +448,10 @@ class SolarEdgeInventoryDataService(SolarEdgeDataService):
 class SolarEdgeEnergyDetailsService(SolarEdgeDataService):
     """Get and update the latest power flow data."""
 
+    endpoint = SolarEdgeEndpoint(
+        "get_energy_details", "energyDetails", "energy details"
+    )
+
     def __init__(self, hass: HomeAssistant, api: Solaredge, site_id: str,
             daily_update_limit: int,
             daylight_update_limit_percentage: Optional[float] = None) -> None:
@@ -186,6 +459,7 @@ class SolarEdgeEnergyDetailsService(SolarEdgeDataService):
         super().__init__(hass, api, site_id, daily_update_limit, daylight_update_limit_percentage)
 
         self.unit = None
+        self._midnight: tuple[date, str] | None = None
 
     def update(self) -> None:
         """Update the data from the SolarEdge Monitoring API."""
@@ -195,45 +469,39 @@ class SolarEdgeEnergyDetailsService(SolarEdgeDataService):
         self.attributes = {}
         self.unit = "kW"
         return
-        try:
-            now = datetime.now()
-            today = date.today()
-            midnight = datetime.combine(today, datetime.min.time())
-            data = self.api.get_energy_details(
-                self.site_id,
-                midnight,
-                now.strftime("%Y-%m-%d %H:%M:%S"),
-                meters=None,
-                time_unit="DAY",
-            )
-            energy_details = data["energyDetails"]
-        except KeyError as ex:
-            raise UpdateFailed("Missing power flow data, skipping update") from ex
+        now = datetime.now()
+        if self._midnight is None or self._midnight[0] != now.date():
+            midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+            self._midnight = (now.date(), midnight.strftime("%Y-%m-%d %H:%M:%S"))
+        self._extract(
+            self._midnight[1],
+            now.strftime("%Y-%m-%d %H:%M:%S"),
+            meters=None,
+            time_unit="DAY",
+        )
 
-        if "meters" not in energy_details:
+    def parse(self, payload: dict) -> None:
+        """Update the energy details data from the API response."""
+        if "meters" not in payload:
             LOGGER.debug(
                 "Missing meters in energy details data. Assuming site does not have any"
             )
             return
 
-        self.data = {}
-        self.attributes = {}
-        self.unit = energy_details["unit"]
+        new_data = {}
+        new_attrs = {}
 
-        for meter in energy_details["meters"]:
+        for meter in payload["meters"]:
             if "type" not in meter or "values" not in meter:
                 continue
-            if meter["type"] not in [
-                "Production",
-                "SelfConsumption",
-                "FeedIn",
-                "Purchased",
-                "Consumption",
-            ]:
+            if meter["type"] not in _ENERGY_DETAILS_METER_TYPES:
                 continue
             if len(meter["values"][0]) == 2:
-                self.data[meter["type"]] = meter["values"][0]["value"]
-                self.attributes[meter["type"]] = {"date": meter["values"][0]["date"]}
+                new_data[meter["type"]] = meter["values"][0]["value"]
+                new_attrs[meter["type"]] = {"date": meter["values"][0]["date"]}
+
+        self.data, self.attributes = new_data, new_attrs
+        self.unit = payload["unit"]
 
         LOGGER.debug(
             "Updated SolarEdge energy details: %s, %s", self.data, self.attributes
@@ -243,6 +511,10 @@ class SolarEdgeEnergyDetailsService(SolarEdgeDataService):
 class SolarEdgePowerFlowDataService(SolarEdgeDataService):
     """Get and update the latest power flow data."""
 
+    endpoint = SolarEdgeEndpoint(
+        "get_current_power_flow", "siteCurrentPowerFlow", "power flow"
+    )
+
     def __init__(self, hass: HomeAssistant, api: Solaredge, site_id: str,
             daily_update_limit: int,
             daylight_update_limit_percentage: Optional[float] = None) -> None:
@@ -259,45 +531,40 @@ class SolarEdgePowerFlowDataService(SolarEdgeDataService):
         self.attributes = {}
         self.unit = "kW"
         return
+        self._extract()
 
-        try:
-            data = self.api.get_current_power_flow(self.site_id)
-            power_flow = data["siteCurrentPowerFlow"]
-        except KeyError as ex:
-            raise UpdateFailed("Missing power flow data, skipping update") from ex
-
-
-        power_from = []
-        power_to = []
-
-        if "connections" not in power_flow:
+    def parse(self, payload: dict) -> None:
+        """Update the power flow data from the API response."""
+        if "connections" not in payload:
             LOGGER.debug(
                 "Missing connections in power flow data. Assuming site does not have any"
             )
             return
 
-        for connection in power_flow["connections"]:
-            power_from.append(connection["from"].lower())
-            power_to.append(connection["to"].lower())
+        power_to = {connection["to"].lower() for connection in payload["connections"]}
 
-        self.data = {}
-        self.attributes = {}
-        self.unit = power_flow["unit"]
-
-        for key, value in power_flow.items():
-            if key in ["LOAD", "PV", "GRID", "STORAGE"]:
-                self.data[key] = value["currentPower"]
-                self.attributes[key] = {"status": value["status"]}
-
-            if key in ["GRID"]:
-                export = key.lower() in power_to
-                self.data[key] *= -1 if export else 1
-                self.attributes[key]["flow"] = "export" if export else "import"
-
-            if key in ["STORAGE"]:
-                charge = key.lower() in power_to
-                self.data[key] *= -1 if charge else 1
-                self.attributes[key]["flow"] = "charge" if charge else "discharge"
-                self.attributes[key]["soc"] = value["chargeLevel"]
+        new_data = {}
+        new_attrs = {}
+
+        for key in _POWER_FLOW_KEYS:
+            if (value := payload.get(key)) is None:
+                continue
+
+            new_data[key] = value["currentPower"]
+            new_attrs[key] = {"status": value["status"]}
+
+            if key == "GRID":
+                export = "grid" in power_to
+                new_data[key] *= -1 if export else 1
+                new_attrs[key]["flow"] = "export" if export else "import"
+
+            if key == "STORAGE":
+                charge = "storage" in power_to
+                new_data[key] *= -1 if charge else 1
+                new_attrs[key]["flow"] = "charge" if charge else "discharge"
+                new_attrs[key]["soc"] = value["chargeLevel"]
+
+        self.data, self.attributes = new_data, new_attrs
+        self.unit = payload["unit"]
 
         LOGGER.debug("Updated SolarEdge power flow: %s, %s", self.data, self.attributes)
@@ -11,3 +11,12 @@ class SolarEdgeSensorEntityDescription(SensorEntityDescription):
     """Sensor entity description for SolarEdge."""
 
     json_key: str | None = None
+
+
+@dataclass(frozen=True)
+class SolarEdgeEndpoint:
+    """Monitoring API endpoint requested by a SolarEdge data service."""
+
+    api_method: str
+    root_key: str
+    name: str
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from typing import Any
-from datetime import timedelta
+from datetime import datetime, timedelta
 
 from solaredge import Solaredge
 
@@ -12,9 +12,9 @@ from homeassistant.const import DEVICE_CLASS_BATTERY, DEVICE_CLASS_POWER, SUN_EV
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.helpers.event import async_track_sunrise, async_track_sunset
-from homeassistant.helpers.sun import get_astral_event_next, is_up
-from homeassistant.util.dt import utcnow 
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.sun import get_astral_event_date
+import homeassistant.util.dt as dt_util
 
 from .const import (
     CONF_SITE_ID,
@@ -30,6 +30,7 @@ from .const import (
 )
 
 from .coordinator import (
+    SolarEdgeCombinedCoordinator,
     SolarEdgeDataService,
     SolarEdgeDetailsDataService,
     SolarEdgeEnergyDetailsService,
@@ -53,13 +54,15 @@ async def async_setup_entry(
         hass, entry.title, entry.data[CONF_SITE_ID], api
     )
 
-    # Set initial update interval based on current daylight condition.
-    daylight = is_up(hass, utcnow())
-    duration = await sensor_factory.get_event_duration(SUN_EVENT_SUNSET if daylight else SUN_EVENT_SUNRISE)
-    for service in sensor_factory.all_services:
-        service.async_setup()
-        await service.recalculate_update_interval(duration, daylight)
-        await service.coordinator.async_refresh()
+    # The initial update interval is set by the first refresh based on current daylight condition.
+    sensor_factory.coordinator.async_setup()
+    sensor_factory.update_sun_events()
+    entry.async_on_unload(
+        async_track_time_change(
+            hass, sensor_factory.midnight_callback, hour=0, minute=0, second=0
+        )
+    )
+    await sensor_factory.coordinator.async_refresh()
 
     entities = []
     for sensor_type in SENSOR_TYPES:
@@ -78,84 +81,56 @@ class SolarEdgeSensorFactory:
         """Initialize the factory."""
         self.platform_name = platform_name
 
-        details = SolarEdgeDetailsDataService(hass, api, site_id, DETAILS_DAILY_UPDATE_LIMIT)
-        overview = SolarEdgeOverviewDataService(hass, api, site_id,
+        self.details = SolarEdgeDetailsDataService(hass, api, site_id, DETAILS_DAILY_UPDATE_LIMIT)
+        self.overview = SolarEdgeOverviewDataService(hass, api, site_id,
             OVERVIEW_DAILY_UPDATE_LIMIT, LIMIT_WHILE_DAYLIGHT_RATIO)
-        inventory = SolarEdgeInventoryDataService(hass, api, site_id,
+        self.inventory = SolarEdgeInventoryDataService(hass, api, site_id,
             INVENTORY_DAILY_UPDATE_LIMIT)
-        flow = SolarEdgePowerFlowDataService(hass, api, site_id,
+        self.flow = SolarEdgePowerFlowDataService(hass, api, site_id,
             POWER_FLOW_DAILY_UPDATE_LIMIT, LIMIT_WHILE_DAYLIGHT_RATIO)
-        energy = SolarEdgeEnergyDetailsService(hass, api, site_id,
+        self.energy = SolarEdgeEnergyDetailsService(hass, api, site_id,
             ENERGY_DETAILS_DAILY_UPDATE_LIMIT, LIMIT_WHILE_DAYLIGHT_RATIO)
 
         self.hass = hass
-        self.all_services = (details, overview, inventory, flow, energy)
-
-        async_track_sunrise(hass, self.sunrise_callback)
-        async_track_sunset(hass, self.sunset_callback)
-        
-        self.services: dict[
-            str,
-            tuple[
-                type[SolarEdgeSensorEntity | SolarEdgeOverviewSensor],
-                SolarEdgeDataService,
-            ],
-        ] = {"site_details": (SolarEdgeDetailsSensor, details)}
-
-        for key in (
-            "lifetime_energy",
-            "energy_this_year",
-            "energy_this_month",
-            "energy_today",
-            "current_power",
-        ):
-            self.services[key] = (SolarEdgeOverviewSensor, overview)
-
-        for key in ("meters", "sensors", "gateways", "batteries", "inverters"):
-            self.services[key] = (SolarEdgeInventorySensor, inventory)
-
-        for key in ("power_consumption", "solar_power", "grid_power", "storage_power"):
-            self.services[key] = (SolarEdgePowerFlowSensor, flow)
-
-        for key in ("storage_level",):
-            self.services[key] = (SolarEdgeStorageLevelSensor, flow)
-
-        for key in (
-            "purchased_power",
-            "production_power",
-            "feedin_power",
-            "consumption_power",
-            "selfconsumption_power",
-        ):
-            self.services[key] = (SolarEdgeEnergyDetailsSensor, energy)
+        self.all_services = (
+            self.details,
+            self.overview,
+            self.inventory,
+            self.flow,
+            self.energy,
+        )
+        self.coordinator = SolarEdgeCombinedCoordinator(hass, self.all_services)
 
     def create_sensor(
         self, sensor_type: SolarEdgeSensorEntityDescription
     ) -> SolarEdgeSensorEntityDescription:
         """Create and return a sensor based on the sensor_key."""
-        sensor_class, service = self.services[sensor_type.key]
+        sensor_class, service = _SENSOR_SERVICES[sensor_type.key]
 
-        return sensor_class(self.platform_name, sensor_type, service)
-
-    async def get_event_duration(self, event) -> timedelta:
-        return get_astral_event_next(self.hass, event) - utcnow()
+        return sensor_class(self.platform_name, sensor_type, getattr(self, service))
 
     @callback
-    async def sunset_callback(self):
-        duration = await self.get_event_duration(SUN_EVENT_SUNSET)
-        await self.recalculate_update_intervals(duration, daylight=False)        
+    def midnight_callback(self, _now: datetime) -> None:
+        """Precompute the daylight period of the new day."""
+        self.update_sun_events()
 
     @callback
-    async def sunrise_callback(self):
-        duration = await self.get_event_duration(SUN_EVENT_SUNRISE)
-        await self.recalculate_update_intervals(duration, daylight=True)
-
-    # Go through all services and refresh the update_interval based on current conditions
-    async def recalculate_update_intervals(self, duration: timedelta, daylight: bool):
-        for service in self.all_services:
-            await service.recalculate_update_interval(duration, daylight)
-            await service.coordinator.async_refresh()
-
+    def update_sun_events(self) -> None:
+        """Set today's sunrise and sunset and tomorrow's sunrise on the coordinator.
+
+        The coordinator picks up the daylight based update interval on its next
+        update. There are no sun events in polar day or night, in which case the
+        default update intervals are used.
+        """
+        today = dt_util.now().date()
+        sun_events = (
+            get_astral_event_date(self.hass, SUN_EVENT_SUNRISE, today),
+            get_astral_event_date(self.hass, SUN_EVENT_SUNSET, today),
+            get_astral_event_date(
+                self.hass, SUN_EVENT_SUNRISE, today + timedelta(days=1)
+            ),
+        )
+        self.coordinator.sun_events = None if None in sun_events else sun_events
 
 
 class SolarEdgeSensorEntity(CoordinatorEntity, SensorEntity):
@@ -176,13 +151,13 @@ class SolarEdgeSensorEntity(CoordinatorEntity, SensorEntity):
         self.data_service = data_service
 
         self._attr_name = f"{platform_name} ({description.name})"
+        if data_service.site_id:
+            self._attr_unique_id = f"{data_service.site_id}_{description.key}"
 
     @property
-    def unique_id(self) -> str | None:
-        """Return a unique ID."""
-        if not self.data_service.site_id:
-            return None
-        return f"{self.data_service.site_id}_{self.entity_description.key}"
+    def available(self) -> bool:
+        """Return if the data service of the entity updated successfully."""
+        return super().available and self.data_service.last_update_success
 
 
 class SolarEdgeOverviewSensor(SolarEdgeSensorEntity):
@@ -197,6 +172,18 @@ class SolarEdgeOverviewSensor(SolarEdgeSensorEntity):
 class SolarEdgeDetailsSensor(SolarEdgeSensorEntity):
     """Representation of an SolarEdge Monitoring API details sensor."""
 
+    def __init__(
+        self,
+        platform_name: str,
+        description: SolarEdgeSensorEntityDescription,
+        data_service: SolarEdgeDataService,
+    ) -> None:
+        """Initialize the details sensor."""
+        super().__init__(platform_name, description, data_service)
+
+        if data_service.site_id:
+            self._attr_unique_id = f"{data_service.site_id}"
+
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return the state attributes."""
@@ -207,21 +194,17 @@ class SolarEdgeDetailsSensor(SolarEdgeSensorEntity):
         """Return the state of the sensor."""
         return self.data_service.data
 
-    @property
-    def unique_id(self) -> str | None:
-        """Return a unique ID."""
-        if not self.data_service.site_id:
-            return None
-        return f"{self.data_service.site_id}"
-
 
 class SolarEdgeInventorySensor(SolarEdgeSensorEntity):
     """Representation of an SolarEdge Monitoring API inventory sensor."""
 
     @property
-    def extra_state_attributes(self) -> dict[str, Any]:
+    def extra_state_attributes(self) -> dict[str, Any] | None:
         """Return the state attributes."""
-        return self.data_service.attributes.get(self.entity_description.json_key)
+        json_key = self.entity_description.json_key
+        if json_key not in self.data_service.attributes:
+            return None
+        return {json_key: self.data_service.attributes[json_key]}
 
     @property
     def native_value(self) -> str | None:
@@ -288,3 +271,38 @@ class SolarEdgeStorageLevelSensor(SolarEdgeSensorEntity):
         if attr and "soc" in attr:
             return attr["soc"]
         return None
+
+
+# Sensor class and SolarEdgeSensorFactory data service attribute per sensor key.
+_SENSOR_SERVICES: dict[str, tuple[type[SolarEdgeSensorEntity], str]] = {
+    "site_details": (SolarEdgeDetailsSensor, "details"),
+    **dict.fromkeys(
+        (
+            "lifetime_energy",
+            "energy_this_year",
+            "energy_this_month",
+            "energy_today",
+            "current_power",
+        ),
+        (SolarEdgeOverviewSensor, "overview"),
+    ),
+    **dict.fromkeys(
+        ("meters", "sensors", "gateways", "batteries", "inverters"),
+        (SolarEdgeInventorySensor, "inventory"),
+    ),
+    **dict.fromkeys(
+        ("power_consumption", "solar_power", "grid_power", "storage_power"),
+        (SolarEdgePowerFlowSensor, "flow"),
+    ),
+    "storage_level": (SolarEdgeStorageLevelSensor, "flow"),
+    **dict.fromkeys(
+        (
+            "purchased_power",
+            "production_power",
+            "feedin_power",
+            "consumption_power",
+            "selfconsumption_power",
+        ),
+        (SolarEdgeEnergyDetailsSensor, "energy"),
+    ),
+}
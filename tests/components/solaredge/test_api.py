@@ -0,0 +1,138 @@
+"""Tests for the SolarEdge API client."""
+from http import HTTPStatus
+from unittest.mock import Mock
+
+import pytest
+from requests.exceptions import HTTPError
+
+from homeassistant.components.solaredge.api import (
+    BASE_URL,
+    REQUEST_TIMEOUT,
+    SolarEdgeClient,
+)
+
+SITE_ID = "1a2b3c4d5e6f7g8h"
+API_KEY = "a1b2c3d4e5f6g7h8"
+ETAG = '"abc123"'
+LAST_MODIFIED = "Wed, 01 Dec 2021 12:00:00 GMT"
+OVERVIEW = {"overview": {"currentPower": {"power": 1000.0}}}
+
+
+def mock_response(status=HTTPStatus.OK, payload=None, headers=None):
+    """Mock a requests response."""
+    response = Mock(status_code=status, headers=headers or {})
+    response.json.return_value = payload
+    if status >= HTTPStatus.BAD_REQUEST:
+        response.raise_for_status.side_effect = HTTPError()
+    return response
+
+
+@pytest.fixture(name="client")
+def mock_client():
+    """Return a client with a mocked session."""
+    client = SolarEdgeClient(API_KEY)
+    client.session = Mock()
+    return client
+
+
+def test_sends_validators(client: SolarEdgeClient) -> None:
+    """Test the stored validators are sent with the next request."""
+    client.session.get.return_value = mock_response(
+        payload=OVERVIEW, headers={"ETag": ETAG, "Last-Modified": LAST_MODIFIED}
+    )
+
+    assert client.get_overview(SITE_ID) == OVERVIEW
+    client.session.get.assert_called_once_with(
+        f"{BASE_URL}/site/{SITE_ID}/overview",
+        params={"api_key": API_KEY},
+        headers={},
+        timeout=REQUEST_TIMEOUT,
+    )
+
+    client.get_overview(SITE_ID)
+    assert client.session.get.call_args.kwargs["headers"] == {
+        "If-None-Match": ETAG,
+        "If-Modified-Since": LAST_MODIFIED,
+    }
+
+
+def test_not_modified_returns_cached_payload(client: SolarEdgeClient) -> None:
+    """Test a 304 answer returns the cached payload."""
+    client.session.get.return_value = mock_response(
+        payload=OVERVIEW, headers={"ETag": ETAG}
+    )
+    assert client.get_overview(SITE_ID) == OVERVIEW
+
+    not_modified = mock_response(status=HTTPStatus.NOT_MODIFIED)
+    client.session.get.return_value = not_modified
+
+    assert client.get_overview(SITE_ID) is OVERVIEW
+    not_modified.json.assert_not_called()
+
+
+def test_cache_dropped_without_validators(client: SolarEdgeClient) -> None:
+    """Test the cache entry is dropped when a response has no validators."""
+    client.session.get.return_value = mock_response(
+        payload=OVERVIEW, headers={"ETag": ETAG}
+    )
+    client.get_overview(SITE_ID)
+
+    client.session.get.return_value = mock_response(payload=OVERVIEW)
+    client.get_overview(SITE_ID)
+    client.get_overview(SITE_ID)
+
+    assert client.session.get.call_args.kwargs["headers"] == {}
+
+
+def test_validators_not_sent_for_other_query(client: SolarEdgeClient) -> None:
+    """Test the validators of one query are not sent with another one."""
+    client.session.get.return_value = mock_response(
+        payload={"energyDetails": {}}, headers={"ETag": ETAG}
+    )
+    client.get_energy_details(SITE_ID, "2021-12-01 00:00:00", "2021-12-01 12:00:00")
+
+    client.session.get.return_value = mock_response(status=HTTPStatus.NOT_MODIFIED)
+    client.get_energy_details(SITE_ID, "2021-12-01 00:00:00", "2021-12-01 12:15:00")
+
+    assert client.session.get.call_args.kwargs["headers"] == {}
+
+
+def test_error_status(client: SolarEdgeClient) -> None:
+    """Test an error status raises HTTPError."""
+    client.session.get.return_value = mock_response(
+        status=HTTPStatus.INTERNAL_SERVER_ERROR
+    )
+
+    with pytest.raises(HTTPError):
+        client.get_overview(SITE_ID)
+
+
+def test_energy_details_params(client: SolarEdgeClient) -> None:
+    """Test the energy details query parameters."""
+    client.session.get.return_value = mock_response(payload={"energyDetails": {}})
+
+    client.get_energy_details(
+        SITE_ID,
+        "2021-12-01 00:00:00",
+        "2021-12-01 12:00:00",
+        meters="Production,Consumption",
+        time_unit="QUARTER_OF_AN_HOUR",
+    )
+    assert client.session.get.call_args.args == (
+        f"{BASE_URL}/site/{SITE_ID}/energyDetails",
+    )
+    assert client.session.get.call_args.kwargs["params"] == {
+        "api_key": API_KEY,
+        "startTime": "2021-12-01 00:00:00",
+        "endTime": "2021-12-01 12:00:00",
+        "meters": "Production,Consumption",
+        "timeUnit": "QUARTER_OF_AN_HOUR",
+    }
+
+    client.get_energy_details(SITE_ID, "2021-12-01 00:00:00", "2021-12-01 12:00:00")
+    assert client.session.get.call_args.kwargs["params"] == {
+        "api_key": API_KEY,
+        "startTime": "2021-12-01 00:00:00",
+        "endTime": "2021-12-01 12:00:00",
+        "timeUnit": "DAY",
+    }
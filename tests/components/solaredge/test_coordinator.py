@@ -0,0 +1,520 @@
+"""Tests for the SolarEdge coordinator."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from requests.exceptions import RequestException
+
+from homeassistant.components.solaredge.const import (
+    FRESH_DATA_MARGIN,
+    LIMIT_WHILE_DAYLIGHT_RATIO,
+    MAX_CONCURRENT_REQUESTS,
+    STALE_DATA_UPDATE_INTERVALS,
+    UNCHANGED_BACKOFF_FACTOR,
+    UNCHANGED_BACKOFF_MAX_FACTOR,
+    UPDATE_FAILURE_TOLERANCE,
+)
+from homeassistant.components.solaredge.coordinator import (
+    SolarEdgeCombinedCoordinator,
+    SolarEdgeDetailsDataService,
+    SolarEdgeOverviewDataService,
+    SolarEdgePowerFlowDataService,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+
+SITE_ID = "1a2b3c4d5e6f7g8h"
+DAILY_LIMIT = 100
+DAY_DURATION = timedelta(days=1)
+DAYLIGHT_DURATION = timedelta(hours=14)
+DARK_DURATION = DAY_DURATION - DAYLIGHT_DURATION
+
+DEFAULT_INTERVAL = DAY_DURATION / DAILY_LIMIT
+DAYLIGHT_INTERVAL = DAYLIGHT_DURATION / (LIMIT_WHILE_DAYLIGHT_RATIO * DAILY_LIMIT)
+DARK_INTERVAL = DARK_DURATION / ((1 - LIMIT_WHILE_DAYLIGHT_RATIO) * DAILY_LIMIT)
+
+# Fixed sun events, so the tests do not depend on astral calculations.
+SUNRISE = datetime(2021, 6, 1, 5, 0, tzinfo=dt_util.UTC)
+SUNSET = SUNRISE + DAYLIGHT_DURATION
+NEXT_SUNRISE = SUNRISE + DAY_DURATION
+
+OVERVIEW = {
+    "overview": {
+        "lifeTimeData": {"energy": 500000.0},
+        "lastYearData": {"energy": 200000.0},
+        "lastMonthData": {"energy": 20000.0},
+        "lastDayData": {"energy": 1000.0},
+        "currentPower": {"power": 1500.0},
+    }
+}
+
+
+class _StubCoordinator:
+    """Stand-in for DataUpdateCoordinator which only keeps the update interval."""
+
+    def __init__(self, *args, update_interval=None, **kwargs):
+        """Initialize the stub coordinator."""
+        self.update_interval = update_interval
+
+
+@pytest.fixture(autouse=True)
+def stub_coordinator(monkeypatch):
+    """Replace DataUpdateCoordinator, the tests only look at the update interval."""
+    monkeypatch.setattr(
+        "homeassistant.components.solaredge.coordinator.DataUpdateCoordinator",
+        _StubCoordinator,
+    )
+
+
+@pytest.fixture(name="mock_hass", scope="module")
+def mock_home_assistant():
+    """Mock Home Assistant, the interval calculation does not need a running instance."""
+    return Mock(spec=HomeAssistant)
+
+
+@pytest.fixture(name="test_api", scope="module")
+def mock_api():
+    """Mock a Solaredge API."""
+    return Mock()
+
+
+@pytest.fixture(name="executor_hass")
+def mock_executor_hass():
+    """Mock Home Assistant running executor jobs and tasks on the event loop."""
+    hass = Mock(spec=HomeAssistant)
+    tasks = []
+
+    async def _async_run_job(target, *args):
+        return target(*args)
+
+    def _create_task(target):
+        task = asyncio.ensure_future(target)
+        tasks.append(task)
+        return task
+
+    async def _async_block_till_done():
+        while pending := [task for task in tasks if not task.done()]:
+            await asyncio.wait(pending)
+
+    hass.async_add_executor_job = Mock(
+        side_effect=lambda target, *args: asyncio.ensure_future(
+            _async_run_job(target, *args)
+        )
+    )
+    hass.async_create_task = Mock(side_effect=_create_task)
+    hass.async_block_till_done = _async_block_till_done
+    return hass
+
+
+@pytest.fixture(name="utcnow")
+def mock_utcnow(monkeypatch):
+    """Mock the clock of the coordinator module."""
+    utcnow = Mock(return_value=SUNRISE)
+    monkeypatch.setattr("homeassistant.components.solaredge.coordinator.utcnow", utcnow)
+    return utcnow
+
+
+@pytest.fixture(name="data_service")
+def mock_data_service(executor_hass: Mock, test_api: Mock, utcnow: Mock):
+    """Return a data service with a mocked update and coordinator."""
+    data_service = SolarEdgeOverviewDataService(
+        executor_hass, test_api, SITE_ID, DAILY_LIMIT
+    )
+    data_service.update = Mock()
+    data_service.coordinator = Mock()
+    return data_service
+
+
+@pytest.mark.parametrize(
+    "ratio,daylight_interval,dark_interval",
+    [
+        (LIMIT_WHILE_DAYLIGHT_RATIO, DAYLIGHT_INTERVAL, DARK_INTERVAL),
+        (0.9, timedelta(minutes=9, seconds=20), timedelta(hours=1)),
+    ],
+)
+async def test_data_service(
+    mock_hass: Mock,
+    test_api: Mock,
+    ratio: float,
+    daylight_interval: timedelta,
+    dark_interval: timedelta,
+) -> None:
+    """Test the daily update limit is distributed over daylight and dark."""
+    data_service = SolarEdgeOverviewDataService(
+        mock_hass, test_api, SITE_ID, DAILY_LIMIT, ratio
+    )
+    assert data_service.current_update_interval == DEFAULT_INTERVAL
+
+    await data_service.recalculate_update_interval(DAYLIGHT_DURATION, daylight=True)
+    assert data_service.current_update_interval == daylight_interval
+
+    await data_service.recalculate_update_interval(DARK_DURATION, daylight=False)
+    assert data_service.current_update_interval == dark_interval
+
+
+async def test_data_service_no_daylight_ratio(mock_hass: Mock, test_api: Mock) -> None:
+    """Test the update interval is fixed without a daylight ratio."""
+    data_service = SolarEdgeOverviewDataService(
+        mock_hass, test_api, SITE_ID, DAILY_LIMIT
+    )
+
+    for duration, daylight in ((DAYLIGHT_DURATION, True), (DARK_DURATION, False)):
+        await data_service.recalculate_update_interval(duration, daylight)
+        assert data_service.current_update_interval == DEFAULT_INTERVAL
+
+
+async def test_combined_coordinator(mock_hass: Mock, test_api: Mock) -> None:
+    """Test the shared coordinator follows the most frequently updated service."""
+    details = SolarEdgeDetailsDataService(mock_hass, test_api, SITE_ID, 2)
+    overview = SolarEdgeOverviewDataService(
+        mock_hass, test_api, SITE_ID, DAILY_LIMIT, LIMIT_WHILE_DAYLIGHT_RATIO
+    )
+    combined = SolarEdgeCombinedCoordinator(mock_hass, (details, overview))
+
+    combined.async_setup()
+    assert details.coordinator is combined.coordinator
+    assert overview.coordinator is combined.coordinator
+    assert combined.coordinator.update_interval == DEFAULT_INTERVAL
+
+    await combined.recalculate_update_interval(DARK_DURATION, daylight=False)
+    assert details.current_update_interval == DAY_DURATION / 2
+    assert combined.coordinator.update_interval == DARK_INTERVAL
+
+
+async def test_combined_coordinator_concurrent_requests(
+    executor_hass: Mock, test_api: Mock
+) -> None:
+    """Test the shared coordinator limits the concurrent API requests."""
+    jobs = []
+
+    def _add_executor_job(target):
+        jobs.append(asyncio.get_running_loop().create_future())
+        return jobs[-1]
+
+    executor_hass.async_add_executor_job = Mock(side_effect=_add_executor_job)
+    services = tuple(
+        SolarEdgeOverviewDataService(executor_hass, test_api, SITE_ID, DAILY_LIMIT)
+        for _ in range(5)
+    )
+    combined = SolarEdgeCombinedCoordinator(executor_hass, services)
+    combined.async_setup()
+
+    update = asyncio.ensure_future(combined.async_update_data())
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert len(jobs) == MAX_CONCURRENT_REQUESTS
+
+    while not update.done():
+        for job in jobs:
+            if not job.done():
+                job.set_result(None)
+        await asyncio.sleep(0)
+    await update
+
+    assert len(jobs) == len(services)
+    assert all(service.last_update_success for service in services)
+
+
+@pytest.mark.parametrize(
+    "now,daylight,service_interval,coordinator_interval",
+    [
+        # The next update is moved forward to pick up daylight at sunrise.
+        (
+            SUNRISE - timedelta(hours=1),
+            False,
+            DARK_INTERVAL,
+            timedelta(hours=1) - FRESH_DATA_MARGIN,
+        ),
+        (SUNRISE, True, DAYLIGHT_INTERVAL, DAYLIGHT_INTERVAL),
+        # The next update is moved forward to pick up the dark period at sunset.
+        (
+            SUNSET - timedelta(minutes=2),
+            True,
+            DAYLIGHT_INTERVAL,
+            timedelta(minutes=2) - FRESH_DATA_MARGIN,
+        ),
+        (SUNSET + timedelta(hours=1), False, DARK_INTERVAL, DARK_INTERVAL),
+    ],
+    ids=["before_sunrise", "sunrise", "before_sunset", "after_sunset"],
+)
+async def test_combined_coordinator_daylight(
+    mock_hass: Mock,
+    test_api: Mock,
+    monkeypatch,
+    now: datetime,
+    daylight: bool,
+    service_interval: timedelta,
+    coordinator_interval: timedelta,
+) -> None:
+    """Test the update interval follows the precomputed daylight period."""
+    monkeypatch.setattr(
+        "homeassistant.components.solaredge.coordinator.utcnow", lambda: now
+    )
+    overview = SolarEdgeOverviewDataService(
+        mock_hass, test_api, SITE_ID, DAILY_LIMIT, LIMIT_WHILE_DAYLIGHT_RATIO
+    )
+    overview.async_update_data = AsyncMock()
+    combined = SolarEdgeCombinedCoordinator(mock_hass, (overview,))
+    combined.async_setup()
+    combined.sun_events = (SUNRISE, SUNSET, NEXT_SUNRISE)
+
+    await combined.async_update_data()
+
+    overview.async_update_data.assert_awaited_once()
+    assert combined.daylight is daylight
+    assert overview.current_update_interval == service_interval
+    assert combined.coordinator.update_interval == coordinator_interval
+
+
+async def test_combined_coordinator_no_sun_events(
+    mock_hass: Mock, test_api: Mock
+) -> None:
+    """Test the default update intervals are used without sunrise and sunset."""
+    overview = SolarEdgeOverviewDataService(
+        mock_hass, test_api, SITE_ID, DAILY_LIMIT, LIMIT_WHILE_DAYLIGHT_RATIO
+    )
+    overview.async_update_data = AsyncMock()
+    combined = SolarEdgeCombinedCoordinator(mock_hass, (overview,))
+    combined.async_setup()
+    combined.sun_events = (SUNRISE, SUNSET, NEXT_SUNRISE)
+    await combined.async_update_data()
+    assert combined.daylight is not None
+
+    combined.sun_events = None
+    await combined.async_update_data()
+
+    assert combined.daylight is None
+    assert overview.current_update_interval == DEFAULT_INTERVAL
+    assert combined.coordinator.update_interval == DEFAULT_INTERVAL
+
+
+async def test_fresh_data_not_updated(data_service: Mock, utcnow: Mock) -> None:
+    """Test fresh data is served without updating it."""
+    await data_service.async_update_data()
+
+    utcnow.return_value = SUNRISE + DEFAULT_INTERVAL / 2
+    await data_service.async_update_data()
+
+    data_service.update.assert_called_once()
+
+
+async def test_stale_data_updated_in_background(
+    data_service: Mock, executor_hass: Mock, utcnow: Mock
+) -> None:
+    """Test stale data is served while a single background update runs."""
+    await data_service.async_update_data()
+
+    utcnow.return_value = SUNRISE + DEFAULT_INTERVAL
+    await data_service.async_update_data()
+    await data_service.async_update_data()
+
+    # The initial fetch and one background update.
+    assert executor_hass.async_create_task.call_count == 2
+    data_service.update.assert_called_once()
+    data_service.coordinator.async_set_updated_data.assert_not_called()
+
+    await executor_hass.async_block_till_done()
+
+    assert data_service.update.call_count == 2
+    data_service.coordinator.async_set_updated_data.assert_called_once_with(None)
+
+
+async def test_update_failed_after_tolerance(data_service: Mock, utcnow: Mock) -> None:
+    """Test UpdateFailed is raised only after consecutive failed updates."""
+    await data_service.async_update_data()
+
+    data_service.update.side_effect = UpdateFailed("Update failed")
+    utcnow.return_value = SUNRISE + DEFAULT_INTERVAL * STALE_DATA_UPDATE_INTERVALS
+    for _ in range(UPDATE_FAILURE_TOLERANCE - 1):
+        await data_service.async_update_data()
+
+    with pytest.raises(UpdateFailed):
+        await data_service.async_update_data()
+    assert data_service.update.call_count == UPDATE_FAILURE_TOLERANCE + 1
+
+
+async def test_request_exception(data_service: Mock) -> None:
+    """Test a request exception is raised as UpdateFailed."""
+    data_service.update.side_effect = RequestException("Connection error")
+
+    with pytest.raises(UpdateFailed):
+        await data_service.async_update_data()
+
+
+@pytest.mark.parametrize("error", [None, UpdateFailed("Update failed")])
+async def test_concurrent_updates_share_fetch(
+    data_service: Mock, executor_hass: Mock, error: UpdateFailed | None
+) -> None:
+    """Test concurrent updates join the fetch which is already in progress."""
+    job = asyncio.get_running_loop().create_future()
+    executor_hass.async_add_executor_job = Mock(return_value=job)
+
+    updates = [
+        asyncio.ensure_future(data_service.async_update_data()) for _ in range(2)
+    ]
+    await asyncio.sleep(0)
+    if error is None:
+        job.set_result(None)
+    else:
+        job.set_exception(error)
+    results = await asyncio.gather(*updates, return_exceptions=True)
+
+    executor_hass.async_add_executor_job.assert_called_once_with(data_service.update)
+    assert results == [error, error]
+    assert data_service._inflight is None
+
+
+def test_unchanged_response_not_parsed(mock_hass: Mock) -> None:
+    """Test an unchanged response is only parsed once."""
+    api = Mock()
+    api.get_overview.return_value = OVERVIEW
+    data_service = SolarEdgeOverviewDataService(mock_hass, api, SITE_ID, DAILY_LIMIT)
+    data_service.api = api
+    data_service.parse = Mock()
+
+    data_service._extract()
+    data_service._extract()
+
+    data_service.parse.assert_called_once_with(OVERVIEW["overview"])
+    assert data_service.update_interval == DEFAULT_INTERVAL * UNCHANGED_BACKOFF_FACTOR
+
+
+async def test_unchanged_backoff(mock_hass: Mock) -> None:
+    """Test the backoff of unchanged responses is capped and reset."""
+    api = Mock()
+    api.get_details.return_value = {"details": {"status": "Active"}}
+    data_service = SolarEdgeDetailsDataService(mock_hass, api, SITE_ID, 2)
+    data_service.api = api
+
+    for _ in range(10):
+        data_service._extract()
+    assert data_service.update_interval == (
+        DAY_DURATION / 2 * UNCHANGED_BACKOFF_MAX_FACTOR
+    )
+
+    await data_service.recalculate_update_interval(DARK_DURATION, daylight=False)
+    assert data_service.update_interval == DAY_DURATION / 2
+
+
+def test_invalid_overview_rejected(mock_hass: Mock) -> None:
+    """Test an invalid overview is rejected every time it is received."""
+    overview = {
+        "overview": {
+            **OVERVIEW["overview"],
+            "lifeTimeData": {"energy": 0.0},
+        }
+    }
+    api = Mock()
+    api.get_overview.return_value = overview
+    data_service = SolarEdgeOverviewDataService(mock_hass, api, SITE_ID, DAILY_LIMIT)
+    data_service.api = api
+
+    for _ in range(2):
+        with pytest.raises(UpdateFailed):
+            data_service._extract()
+    assert data_service.data == {}
+
+
+def test_details_parse(mock_hass: Mock, test_api: Mock) -> None:
+    """Test the details are parsed into the status and snake case attributes."""
+    data_service = SolarEdgeDetailsDataService(mock_hass, test_api, SITE_ID, 2)
+
+    data_service.parse(
+        {
+            "id": 1234,
+            "name": "Home",
+            "status": "Active",
+            "peakPower": 6.5,
+            "lastUpdateTime": "2021-12-01",
+            "installationDate": "2020-06-01",
+            "type": "Optimizers & Inverters",
+            "primaryModule": {
+                "manufacturerName": "SolarEdge",
+                "modelName": "P370",
+                "maximumPower": 370.0,
+                "temperatureCoef": -0.4,
+            },
+        }
+    )
+
+    assert data_service.data == "Active"
+    assert data_service.attributes == {
+        "name": "Home",
+        "peak_power": 6.5,
+        "last_update_time": "2021-12-01",
+        "installation_date": "2020-06-01",
+        "type": "Optimizers & Inverters",
+        "manufacturer_name": "SolarEdge",
+        "model_name": "P370",
+        "maximum_power": 370.0,
+        "temperature_coef": -0.4,
+    }
+
+
+@pytest.mark.parametrize(
+    "connections,grid,storage",
+    [
+        (
+            [
+                {"from": "PV", "to": "Load"},
+                {"from": "PV", "to": "Grid"},
+                {"from": "PV", "to": "Storage"},
+            ],
+            (-2.0, {"status": "Active", "flow": "export"}),
+            (-1.0, {"status": "Active", "flow": "charge", "soc": 50}),
+        ),
+        (
+            [{"from": "GRID", "to": "Load"}, {"from": "STORAGE", "to": "Load"}],
+            (2.0, {"status": "Active", "flow": "import"}),
+            (1.0, {"status": "Active", "flow": "discharge", "soc": 50}),
+        ),
+    ],
+    ids=["export_charge", "import_discharge"],
+)
+def test_power_flow_parse(
+    mock_hass: Mock,
+    test_api: Mock,
+    connections: list[dict[str, str]],
+    grid: tuple[float, dict],
+    storage: tuple[float, dict],
+) -> None:
+    """Test the grid and storage power is signed by the direction of the flow."""
+    data_service = SolarEdgePowerFlowDataService(
+        mock_hass, test_api, SITE_ID, DAILY_LIMIT
+    )
+
+    data_service.parse(
+        {
+            "unit": "kW",
+            "connections": connections,
+            "LOAD": {"status": "Active", "currentPower": 3.0},
+            "GRID": {"status": "Active", "currentPower": 2.0},
+            "STORAGE": {"status": "Active", "currentPower": 1.0, "chargeLevel": 50},
+        }
+    )
+
+    # The PV element is missing and skipped.
+    assert data_service.data == {"LOAD": 3.0, "GRID": grid[0], "STORAGE": storage[0]}
+    assert data_service.attributes == {
+        "LOAD": {"status": "Active"},
+        "GRID": grid[1],
+        "STORAGE": storage[1],
+    }
+    assert data_service.unit == "kW"
+
+
+def test_power_flow_parse_no_connections(mock_hass: Mock, test_api: Mock) -> None:
+    """Test a power flow without connections is skipped."""
+    data_service = SolarEdgePowerFlowDataService(
+        mock_hass, test_api, SITE_ID, DAILY_LIMIT
+    )
+
+    data_service.parse({"unit": "kW", "PV": {"status": "Active", "currentPower": 0}})
+
+    assert data_service.data == {}
+    assert data_service.attributes == {}
+    assert data_service.unit is None
@@ -0,0 +1,31 @@
+"""Tests for the SolarEdge sensors."""
+from unittest.mock import Mock
+
+from homeassistant.components.solaredge.const import SENSOR_TYPES
+from homeassistant.components.solaredge.coordinator import SolarEdgeInventoryDataService
+from homeassistant.components.solaredge.sensor import SolarEdgeInventorySensor
+from homeassistant.core import HomeAssistant
+
+SITE_ID = "1a2b3c4d5e6f7g8h"
+INVERTERS = [{"name": "Inverter 1", "SN": "7E123456"}]
+
+
+def test_inventory_sensor_attributes() -> None:
+    """Test the inventory sensors expose the inventory of their own key."""
+    data_service = SolarEdgeInventoryDataService(
+        Mock(spec=HomeAssistant), Mock(), SITE_ID, 2
+    )
+    data_service.parse({"inverters": INVERTERS, "meters": []})
+    descriptions = {description.key: description for description in SENSOR_TYPES}
+
+    inverters = SolarEdgeInventorySensor(
+        "SolarEdge", descriptions["inverters"], data_service
+    )
+    assert inverters.native_value == 1
+    assert inverters.extra_state_attributes == {"inverters": INVERTERS}
+
+    batteries = SolarEdgeInventorySensor(
+        "SolarEdge", descriptions["batteries"], data_service
+    )
+    assert batteries.native_value is None
+    assert batteries.extra_state_attributes is None